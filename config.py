@@ -35,6 +35,10 @@ DEFAULT_CHART_DAYS = 30
 CHART_FIGURE_SIZE = (10, 6)
 CHART_DPI = 100
 
+# Charts saved between sessions; bump the version when chart code changes
+CHART_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".calorie_tracker_cache")
+CHART_CACHE_VERSION = 1
+
 # Color Schemes
 CHART_COLORS = {
     'protein': '#FF6B6B',     # Red
@@ -94,32 +98,39 @@ def get_backup_filename():
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     return f"{BACKUP_PREFIX}_{timestamp}.xlsx"
 
+# Validation bounds and messages per field type, built once at import
+_BOUNDS = {
+    'calories': (MIN_CALORIES, MAX_CALORIES),
+    'protein': (MIN_MACROS, MAX_MACROS),
+    'carbs': (MIN_MACROS, MAX_MACROS),
+    'fat': (MIN_MACROS, MAX_MACROS),
+    'weight': (MIN_WEIGHT, MAX_WEIGHT),
+    'goal': (MIN_GOAL, MAX_GOAL)
+}
+
+_VALIDATION_MESSAGES = {
+    'calories': f"Calories must be between {MIN_CALORIES} and {MAX_CALORIES}",
+    'protein': f"Protein must be between {MIN_MACROS}g and {MAX_MACROS}g",
+    'carbs': f"Carbs must be between {MIN_MACROS}g and {MAX_MACROS}g",
+    'fat': f"Fat must be between {MIN_MACROS}g and {MAX_MACROS}g",
+    'weight': f"Weight must be between {MIN_WEIGHT} and {MAX_WEIGHT} lbs",
+    'goal': f"Calorie goal must be between {MIN_GOAL} and {MAX_GOAL}"
+}
+
 def validate_numeric_input(value, field_type):
     """Validate numeric input based on field type"""
     try:
         num_value = float(value)
-        
-        if field_type == 'calories':
-            return MIN_CALORIES <= num_value <= MAX_CALORIES
-        elif field_type in ['protein', 'carbs', 'fat']:
-            return MIN_MACROS <= num_value <= MAX_MACROS
-        elif field_type == 'weight':
-            return MIN_WEIGHT <= num_value <= MAX_WEIGHT
-        elif field_type == 'goal':
-            return MIN_GOAL <= num_value <= MAX_GOAL
-        
-        return True
     except (ValueError, TypeError):
         return False
+    
+    bounds = _BOUNDS.get(field_type)
+    if bounds is None:
+        return True
+    
+    low, high = bounds
+    return low <= num_value <= high
 
 def get_validation_message(field_type):
     """Get validation error message for field type"""
-    messages = {
-        'calories': f"Calories must be between {MIN_CALORIES} and {MAX_CALORIES}",
-        'protein': f"Protein must be between {MIN_MACROS}g and {MAX_MACROS}g",
-        'carbs': f"Carbs must be between {MIN_MACROS}g and {MAX_MACROS}g",
-        'fat': f"Fat must be between {MIN_MACROS}g and {MAX_MACROS}g",
-        'weight': f"Weight must be between {MIN_WEIGHT} and {MAX_WEIGHT} lbs",
-        'goal': f"Calorie goal must be between {MIN_GOAL} and {MAX_GOAL}"
-    }
-    return messages.get(field_type, "Invalid value")
\ No newline at end of file
+    return _VALIDATION_MESSAGES.get(field_type, "Invalid value")
\ No newline at end of file
@@ -3,43 +3,204 @@ Data Manager module for the Calorie Tracker application
 Handles all spreadsheet operations and data persistence
 """
 
-import pandas as pd
 import os
+import sys
+import shutil
+import threading
+import functools
 from datetime import datetime
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+from config import DEFAULT_DATA_FILENAME, BACKUP_PREFIX
+
 logger = logging.getLogger(__name__)
 
+# Update keys mapped to their spreadsheet columns
+ADDITIVE_FIELDS = {'calories': 'Calories', 'protein': 'Protein', 'carbs': 'Carbs', 'fat': 'Fat'}
+SET_FIELDS = {'weight': 'Weight', 'goal': 'Calorie_Goal'}
+
+# Numeric columns are stored as float64 so they hold typed numpy arrays
+# (with NaN for missing values) rather than boxed Python objects
+NUMERIC_COLUMNS = ['Calories', 'Protein', 'Carbs', 'Fat', 'Weight', 'Calorie_Goal']
+
+# Directory holding the data and backup files, resolved once at import
+_DATA_DIR = os.getcwd()
+
+# Linux ioctl that clones a file's blocks on copy-on-write filesystems
+# (Btrfs, XFS, bcachefs) instead of copying the data
+_FICLONE = 0x40049409
+
+# pandas is imported on first use so importing this module stays cheap
+_pd = None
+
+
+def _pandas():
+    """Import pandas on first use and return the module"""
+    global _pd
+    if _pd is None:
+        import pandas as pd
+        _pd = pd
+    return _pd
+
+
+def _locked(method):
+    """Run a DataManager method while holding the instance's lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _copy_file(src, dst):
+    """Copy src to dst with metadata, as a reflink clone where supported"""
+    if sys.platform.startswith('linux'):
+        try:
+            import fcntl
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            # Not supported by this filesystem; fall back to a regular copy
+            pass
+    shutil.copy2(src, dst)
+
 
 class DataManager:
-    def __init__(self, filename="calorie_data.xlsx"):
-        """Initialize the data manager with the specified filename"""
+    def __init__(self, filename=DEFAULT_DATA_FILENAME):
+        """Initialize the data manager with the specified filename
+        
+        The storage format follows the file extension: ``.xlsx`` files are
+        read and written with openpyxl, ``.parquet`` files with pyarrow.
+        """
         self.filename = filename
-        self.filepath = os.path.join(os.getcwd(), self.filename)
+        self.filepath = os.path.join(_DATA_DIR, self.filename)
+        self.use_parquet = os.path.splitext(self.filename)[1].lower() == '.parquet'
         self.columns = ['Date', 'Calories', 'Protein', 'Carbs', 'Fat', 'Weight', 'Calorie_Goal']
         
+        # Last loaded/saved dataframe (sorted by date), its parsed dates, a
+        # date -> row position map and the file modification time it matches
+        self._cache_df = None
+        self._cache_dt_index = None
+        self._date_to_row = {}
+        self._cache_mtime = None
+        
+        # Bumped whenever the cached data changes, so callers holding derived
+        # data can tell when it is stale
+        self.data_version = 0
+        
+        # Serializes access to the cache and the file (charts load data from
+        # a background thread)
+        self._lock = threading.RLock()
+        
         # Ensure the data file exists
         self.ensure_data_file_exists()
     
     def ensure_data_file_exists(self):
         """Create the data file if it doesn't exist"""
-        if not os.path.exists(self.filepath):
-            try:
-                # Create empty dataframe with proper columns
-                df = pd.DataFrame(columns=self.columns)
-                df.to_excel(self.filepath, index=False)
-                logger.info(f"Created new data file: {self.filepath}")
-            except Exception as e:
-                logger.error(f"Failed to create data file: {str(e)}")
-                raise
+        # Claim the path atomically so concurrent initializations can't both
+        # create the file; the placeholder is then replaced by the real file
+        try:
+            fd = os.open(self.filepath, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return
+        os.close(fd)
+        
+        try:
+            legacy_path = os.path.splitext(self.filepath)[0] + '.xlsx'
+            if self.use_parquet and os.path.exists(legacy_path):
+                # One-time migration from the legacy Excel file
+                df = _pandas().read_excel(legacy_path)
+                df['Date'] = df['Date'].astype(str)
+                self.atomic_write(self.filepath, lambda path: self.write_file(df, path))
+                logger.info("Migrated %s to %s", legacy_path, self.filepath)
+                return
+            
+            # Create empty dataframe with proper columns
+            df = self.empty_frame()
+            self.atomic_write(self.filepath, lambda path: self.write_file(df, path))
+            logger.info("Created new data file: %s", self.filepath)
+        except Exception as e:
+            logger.error("Failed to create data file: %s", e)
+            # Don't leave the empty placeholder behind
+            os.unlink(self.filepath)
+            raise
+    
+    def empty_frame(self):
+        """Create an empty dataframe with the data columns and their dtypes"""
+        pd = _pandas()
+        return pd.DataFrame({
+            col: pd.Series(dtype='float64' if col in NUMERIC_COLUMNS else str)
+            for col in self.columns
+        })
+    
+    def read_file(self, path):
+        """Read a dataframe from a file in the configured storage format"""
+        pd = _pandas()
+        if self.use_parquet:
+            return pd.read_parquet(path)
+        # Read-only mode streams rows instead of building every cell object
+        return pd.read_excel(path, engine='openpyxl', engine_kwargs={'read_only': True})
+    
+    def write_file(self, df, path):
+        """Write a dataframe to a file in the configured storage format"""
+        if self.use_parquet:
+            df.to_parquet(path, index=False, compression="zstd")
+        else:
+            self.write_excel(df, path)
+    
+    def atomic_write(self, path, write):
+        """Call write() on a sibling temp file, then swap it into place
+        
+        A crash mid-write leaves the existing file untouched instead of
+        truncating the only copy.
+        """
+        tmp_path = path + ".tmp"
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+    
+    def write_excel(self, df, path):
+        """Stream a dataframe into a write-only openpyxl workbook
+        
+        pandas' ExcelWriter builds a styled cell object for every value;
+        write-only mode appends plain rows, which is noticeably faster.
+        """
+        from openpyxl import Workbook
+        
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet('Sheet1')
+        sheet.append(list(df.columns))
+        
+        # Write missing values as empty cells
+        rows = df.astype(object).where(df.notna(), None)
+        for row in rows.itertuples(index=False, name=None):
+            sheet.append(row)
+        
+        workbook.save(path)
     
+    @_locked
     def load_data(self):
-        """Load data from the Excel file"""
+        """Load data from the data file
+        
+        The file is only re-read when it changed on disk. The returned frame
+        is shared with the cache: treat it as read-only and call .copy()
+        before modifying it.
+        """
+        pd = _pandas()
         try:
             if os.path.exists(self.filepath):
-                df = pd.read_excel(self.filepath)
+                # Reuse the cached dataframe while the file is unchanged
+                mtime = os.stat(self.filepath).st_mtime_ns
+                if self._cache_df is not None and mtime == self._cache_mtime:
+                    return self._cache_df
+                
+                df = self.read_file(self.filepath)
                 
                 # Ensure all required columns exist
                 for col in self.columns:
@@ -50,36 +211,76 @@ class DataManager:
                 if 'Date' in df.columns:
                     df['Date'] = df['Date'].astype(str)
                 
-                return df
+                # Ensure numeric columns are float64; stray text becomes NaN
+                for col in NUMERIC_COLUMNS:
+                    df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+                
+                self._set_cache(df, mtime)
+                return self._cache_df
             else:
                 # Create empty dataframe if file doesn't exist
-                return pd.DataFrame(columns=self.columns)
+                return self.empty_frame()
                 
         except Exception as e:
-            logger.error(f"Failed to load data: {str(e)}")
+            logger.error("Failed to load data: %s", e)
             # Return empty dataframe on error
-            return pd.DataFrame(columns=self.columns)
+            return self.empty_frame()
+    
+    def _set_cache(self, df, mtime):
+        """Cache a date-sorted copy of df along with its parsed dates"""
+        import numpy as np
+        
+        # Parse the dates once per file version; unparseable dates become NaT
+        # and sort to the end
+        dates = _pandas().to_datetime(df['Date'], format='ISO8601', errors='coerce').to_numpy()
+        if len(dates) > 1 and not (dates[1:] >= dates[:-1]).all():
+            order = np.argsort(dates, kind='stable')
+            df = df.take(order)
+            dates = dates[order]
+        
+        # A fresh RangeIndex keeps len(df) free as the next row label
+        self._cache_df = df.reset_index(drop=True)
+        self._cache_dt_index = dates
+        
+        # Map each date to its row position; on duplicates the first row wins
+        date_values = self._cache_df['Date'].tolist()
+        self._date_to_row = dict(zip(reversed(date_values), reversed(range(len(date_values)))))
+        self._cache_mtime = mtime
+        self.data_version += 1
     
+    @_locked
     def save_data(self, df):
-        """Save dataframe to Excel file"""
+        """Save dataframe to the data file"""
         try:
             # Ensure Date column is properly formatted
             if 'Date' in df.columns:
                 df['Date'] = df['Date'].astype(str)
             
-            # Save to Excel
-            df.to_excel(self.filepath, index=False)
-            logger.info(f"Data saved successfully to {self.filepath}")
+            # Save to disk
+            self.atomic_write(self.filepath, lambda path: self.write_file(df, path))
+            logger.info("Data saved successfully to %s", self.filepath)
+            
+            # Keep the cache in sync so the next load doesn't re-read the file
+            self._set_cache(df, os.stat(self.filepath).st_mtime_ns)
             return True
             
         except Exception as e:
-            logger.error(f"Failed to save data: {str(e)}")
+            logger.error("Failed to save data: %s", e)
             return False
     
     def get_all_data(self):
         """Get all data from the spreadsheet"""
         return self.load_data()
     
+    def get_all_data_sorted(self):
+        """Get all data, newest date first
+        
+        The cache is already in date order, so this is a reversed view of it
+        rather than a sort. Like load_data, treat the result as read-only.
+        """
+        return self.load_data().iloc[::-1]
+    
+    @_locked
     def get_day_data(self, date_str):
         """Get data for a specific date"""
         try:
@@ -88,100 +289,97 @@ class DataManager:
             if df.empty:
                 return None
             
-            # Filter for the specific date
-            day_data = df[df['Date'] == date_str]
-            
-            if day_data.empty:
+            # Look up the row for the date
+            row_index = self._date_to_row.get(date_str)
+            if row_index is None:
                 return None
             
             # Return the data as a dictionary
-            return day_data.iloc[0].to_dict()
+            row = df.iloc[row_index]
+            return {col: row[col] for col in self.columns}
             
         except Exception as e:
-            logger.error(f"Failed to get day data: {str(e)}")
+            logger.error("Failed to get day data: %s", e)
             return None
     
+    @_locked
     def update_day_data(self, date_str, updates):
         """Update data for a specific date"""
         try:
-            df = self.load_data()
+            # Work on a private copy; the loaded frame is shared with the cache
+            df = self.load_data().copy()
             
-            # Check if date already exists
-            existing_row = df[df['Date'] == date_str]
+            # Check if date already exists (an empty frame didn't come from the cache)
+            row_index = self._date_to_row.get(date_str) if not df.empty else None
             
-            if existing_row.empty:
+            if row_index is None:
                 # Create new row for this date
-                new_row = {col: 0 if col != 'Date' else date_str for col in self.columns}
+                new_row = {col: 0.0 if col != 'Date' else date_str for col in self.columns}
                 new_row['Date'] = date_str
-                df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-                row_index = len(df) - 1
+                
+                # Enlarge in place rather than concatenating a copy of every column;
+                # the dict is aligned to the columns by name
+                row_index = len(df)
+                df.loc[row_index] = new_row
+                original = None
             else:
-                row_index = existing_row.index[0]
-            
-            # Apply updates
-            for field, value in updates.items():
-                if field == 'calories':
-                    # Add to existing calories
-                    current = df.at[row_index, 'Calories'] if not pd.isna(df.at[row_index, 'Calories']) else 0
-                    df.at[row_index, 'Calories'] = current + value
-                    
-                elif field == 'protein':
-                    # Add to existing protein
-                    current = df.at[row_index, 'Protein'] if not pd.isna(df.at[row_index, 'Protein']) else 0
-                    df.at[row_index, 'Protein'] = current + value
-                    
-                elif field == 'carbs':
-                    # Add to existing carbs
-                    current = df.at[row_index, 'Carbs'] if not pd.isna(df.at[row_index, 'Carbs']) else 0
-                    df.at[row_index, 'Carbs'] = current + value
-                    
-                elif field == 'fat':
-                    # Add to existing fat
-                    current = df.at[row_index, 'Fat'] if not pd.isna(df.at[row_index, 'Fat']) else 0
-                    df.at[row_index, 'Fat'] = current + value
-                    
-                elif field == 'weight':
-                    # Set weight (not additive)
-                    df.at[row_index, 'Weight'] = value
-                    
-                elif field == 'goal':
-                    # Set calorie goal (not additive)
-                    df.at[row_index, 'Calorie_Goal'] = value
+                original = df.loc[row_index, self.columns].copy()
+            
+            # Additive fields (calories, macros) accumulate onto the day's totals
+            additive_columns = list(ADDITIVE_FIELDS.values())
+            df.loc[row_index, additive_columns] = df.loc[row_index, additive_columns].fillna(0)
+            for field, column in ADDITIVE_FIELDS.items():
+                if field in updates:
+                    df.at[row_index, column] += updates[field]
+            
+            # Set fields (weight, goal) replace the stored value
+            set_fields = [field for field in updates if field in SET_FIELDS]
+            if set_fields:
+                df.loc[row_index, [SET_FIELDS[field] for field in set_fields]] = [updates[field] for field in set_fields]
+            
+            # Nothing to write if the update left an existing row as it was
+            if original is not None and original.equals(df.loc[row_index, self.columns]):
+                return True
             
             # Save the updated data
             return self.save_data(df)
             
         except Exception as e:
-            logger.error(f"Failed to update day data: {str(e)}")
+            logger.error("Failed to update day data: %s", e)
             return False
     
-    def get_date_range_data(self, start_date, end_date):
-        """Get data for a specific date range"""
+    @_locked
+    def get_date_range_data(self, start_date, end_date, columns=None):
+        """Get data for a specific date range, optionally only the given columns"""
+        pd = _pandas()
         try:
+            import numpy as np
+            
             df = self.load_data()
             
             if df.empty:
                 return pd.DataFrame()
             
-            # Convert dates to datetime for comparison
-            df['Date_dt'] = pd.to_datetime(df['Date'])
-            start_dt = pd.to_datetime(start_date)
-            end_dt = pd.to_datetime(end_date)
-            
-            # Filter data
-            filtered_df = df[(df['Date_dt'] >= start_dt) & (df['Date_dt'] <= end_dt)]
-            
-            # Remove the temporary datetime column
-            filtered_df = filtered_df.drop('Date_dt', axis=1)
+            # The cache is sorted by date, so the range is a contiguous slice
+            # found by binary search on the parsed dates
+            start_dt = pd.Timestamp(start_date).to_datetime64()
+            end_dt = pd.Timestamp(end_date).to_datetime64()
+            lo = np.searchsorted(self._cache_dt_index, start_dt, side='left')
+            hi = np.searchsorted(self._cache_dt_index, end_dt, side='right')
             
-            return filtered_df.sort_values('Date')
+            rows = df.iloc[lo:hi]
+            if columns is not None:
+                # Copy only the columns the caller needs
+                rows = rows[list(columns)]
+            return rows.copy()
             
         except Exception as e:
-            logger.error(f"Failed to get date range data: {str(e)}")
+            logger.error("Failed to get date range data: %s", e)
             return pd.DataFrame()
     
-    def get_recent_data(self, days=30):
-        """Get data for the last N days"""
+    def get_recent_data(self, days=30, columns=None):
+        """Get data for the last N days, optionally only the given columns"""
+        pd = _pandas()
         try:
             from datetime import datetime, timedelta
             
@@ -189,24 +387,25 @@ class DataManager:
             start_date = end_date - timedelta(days=days-1)
             
             return self.get_date_range_data(start_date.strftime('%Y-%m-%d'), 
-                                          end_date.strftime('%Y-%m-%d'))
+                                          end_date.strftime('%Y-%m-%d'), columns)
             
         except Exception as e:
-            logger.error(f"Failed to get recent data: {str(e)}")
+            logger.error("Failed to get recent data: %s", e)
             return pd.DataFrame()
     
+    @_locked
     def delete_day_data(self, date_str):
         """Delete data for a specific date"""
         try:
             df = self.load_data()
             
             # Remove the row with the specified date
-            df = df[df['Date'] != date_str]
+            df = df[df['Date'] != date_str].copy()
             
             return self.save_data(df)
             
         except Exception as e:
-            logger.error(f"Failed to delete day data: {str(e)}")
+            logger.error("Failed to delete day data: %s", e)
             return False
     
     def get_summary_stats(self, days=30):
@@ -217,16 +416,17 @@ class DataManager:
             if df.empty:
                 return None
             
-            # Calculate statistics
+            # Calculate statistics; all-NaN columns average to 0
+            means = df[['Calories', 'Protein', 'Carbs', 'Fat', 'Weight']].mean(skipna=True).fillna(0)
             stats = {
-                'avg_calories': df['Calories'].mean() if not df['Calories'].isna().all() else 0,
-                'avg_protein': df['Protein'].mean() if not df['Protein'].isna().all() else 0,
-                'avg_carbs': df['Carbs'].mean() if not df['Carbs'].isna().all() else 0,
-                'avg_fat': df['Fat'].mean() if not df['Fat'].isna().all() else 0,
-                'avg_weight': df['Weight'].mean() if not df['Weight'].isna().all() else 0,
+                'avg_calories': means['Calories'],
+                'avg_protein': means['Protein'],
+                'avg_carbs': means['Carbs'],
+                'avg_fat': means['Fat'],
+                'avg_weight': means['Weight'],
                 'weight_change': None,
                 'goal_achievement_rate': 0,
-                'days_with_data': len(df[df['Calories'] > 0])
+                'days_with_data': int((df['Calories'] > 0).sum())
             }
             
             # Calculate weight change if we have weight data
@@ -239,13 +439,12 @@ class DataManager:
             # Calculate goal achievement rate
             goal_data = df.dropna(subset=['Calories', 'Calorie_Goal'])
             if not goal_data.empty:
-                goals_met = len(goal_data[goal_data['Calories'] >= goal_data['Calorie_Goal']])
-                stats['goal_achievement_rate'] = (goals_met / len(goal_data)) * 100
+                stats['goal_achievement_rate'] = (goal_data['Calories'] >= goal_data['Calorie_Goal']).mean() * 100
             
             return stats
             
         except Exception as e:
-            logger.error(f"Failed to get summary stats: {str(e)}")
+            logger.error("Failed to get summary stats: %s", e)
             return None
     
     def backup_data(self, backup_filename=None):
@@ -253,17 +452,17 @@ class DataManager:
         try:
             if backup_filename is None:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                backup_filename = f"calorie_data_backup_{timestamp}.xlsx"
+                extension = os.path.splitext(self.filename)[1]
+                backup_filename = f"{BACKUP_PREFIX}_{timestamp}{extension}"
             
-            backup_path = os.path.join(os.getcwd(), backup_filename)
+            backup_path = os.path.join(_DATA_DIR, backup_filename)
             
             # Copy the current data file
-            import shutil
-            shutil.copy2(self.filepath, backup_path)
+            self.atomic_write(backup_path, lambda path: _copy_file(self.filepath, path))
             
-            logger.info(f"Backup created: {backup_path}")
+            logger.info("Backup created: %s", backup_path)
             return backup_path
             
         except Exception as e:
-            logger.error(f"Failed to create backup: {str(e)}")
+            logger.error("Failed to create backup: %s", e)
             return None
\ No newline at end of file
@@ -3,26 +3,121 @@ GUI module for the Calorie Tracker application
 Handles all user interface components and interactions
 """
 
+import os
+import re
+import queue
+import pickle
+import threading
+import hashlib
+import logging
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from functools import lru_cache
+import numpy as np
+from config import CHART_CACHE_DIR, CHART_CACHE_VERSION
 from data_manager import DataManager
-from visualizer import Visualizer
+
+logger = logging.getLogger(__name__)
+
+# Table columns after Date: (data column, number format, text for missing values)
+TABLE_FORMATS = [
+    ('Calories', '%.0f', "0"),
+    ('Protein', '%.1f', "0.0"),
+    ('Carbs', '%.1f', "0.0"),
+    ('Fat', '%.1f', "0.0"),
+    ('Weight', '%.1f', ""),
+    ('Calorie_Goal', '%.0f', ""),
+]
+
+# YYYY-MM-DD, checked before building a datetime
+_DATE_RE = re.compile(r'([0-9]{4})-([0-9]{2})-([0-9]{2})')
+
+# Plain decimal numbers accepted in the entry fields
+_NUM_RE = re.compile(r'-?(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)')
+
+# Entry fields in the order they are read
+ENTRY_FIELDS = ['calories', 'protein', 'carbs', 'fat', 'weight', 'goal']
+
+
+@lru_cache(maxsize=128)
+def is_valid_date(date_str):
+    """Check that a string is a real calendar date in YYYY-MM-DD format"""
+    match = _DATE_RE.fullmatch(date_str)
+    if not match:
+        return False
+    try:
+        datetime(int(match[1]), int(match[2]), int(match[3]))
+    except ValueError:
+        return False
+    return True
+
+
+def format_value(value, fmt, missing):
+    """Format a single number, using missing for NaN (the only value unequal to itself)"""
+    return missing if value != value else fmt % value
+
+
+def format_column(values, fmt, missing):
+    """Format a numeric column as strings in one pass, using missing for NaN"""
+    values = np.asarray(values, dtype=float)
+    nan = np.isnan(values)
+    formatted = np.char.mod(fmt, np.where(nan, 0.0, values))
+    return np.where(nan, missing, formatted).tolist()
 
 
 class CalorieTrackerGUI:
     def __init__(self, root):
         self.root = root
         self.data_manager = DataManager()
-        self.visualizer = Visualizer(self.data_manager)
+        self._visualizer = None
+        
+        # Sorted table data, reused until the data changes
+        self._data_rev = 0
+        self._cached_df = None
+        
+        # Treeview item id and formatted values of each displayed date, for
+        # single-row updates and for refreshes that reformat only what changed
+        self._row_iid_by_date = {}
+        self._row_cache = {}
+        
+        # One reusable canvas per chart type, and the (days, data revision) it shows
+        self._chart_canvases = {}
+        self._chart_keys = {}
+        
+        # Pending debounced chart update, if any
+        self._chart_after_id = None
+        
+        # Charts are built on a worker thread and handed back through a queue;
+        # only the result of the latest request is displayed
+        self._chart_requests = queue.Queue()
+        self._chart_results = queue.Queue()
+        self._chart_request_id = 0
+        self._charts_pending = 0
+        self._chart_worker = None
+        
+        # Per chart type: the latest request id, and the builds still queued or
+        # running (a figure is only ever drawn by one of them at a time)
+        self._chart_latest = {}
+        self._chart_builds = {}
+        
+        # Day summaries keyed by (date, data revision), and the text currently shown
+        self._format_day_info = lru_cache(maxsize=32)(self.format_day_info)
+        self._last_info_text = None
         
         # Initialize the GUI
         self.setup_window()
         self.create_widgets()
         self.refresh_display()
     
+    @property
+    def visualizer(self):
+        """Get the chart builder, importing matplotlib only when charts are first needed"""
+        if self._visualizer is None:
+            from visualizer import Visualizer
+            self._visualizer = Visualizer(self.data_manager)
+        return self._visualizer
+    
     def setup_window(self):
         """Configure the main window"""
         self.root.title("Calorie Tracker")
@@ -110,7 +205,7 @@ class CalorieTrackerGUI:
         controls_frame = ttk.Frame(view_frame)
         controls_frame.pack(fill=tk.X, padx=10, pady=5)
         
-        ttk.Button(controls_frame, text="Refresh Data", command=self.refresh_display).pack(side=tk.LEFT, padx=5)
+        ttk.Button(controls_frame, text="Refresh Data", command=self.reload_display).pack(side=tk.LEFT, padx=5)
         
         # Treeview for data display
         columns = ("Date", "Calories", "Protein", "Carbs", "Fat", "Weight", "Goal")
@@ -145,6 +240,7 @@ class CalorieTrackerGUI:
         self.days_var = tk.StringVar(value="30")
         days_combo = ttk.Combobox(chart_controls, textvariable=self.days_var, values=["7", "14", "30", "60", "90"], width=5)
         days_combo.pack(side=tk.LEFT, padx=5)
+        days_combo.bind('<<ComboboxSelected>>', self._schedule_update_charts)
         
         ttk.Button(chart_controls, text="Update Charts", command=self.update_charts).pack(side=tk.LEFT, padx=5)
         
@@ -154,11 +250,15 @@ class CalorieTrackerGUI:
         chart_combo = ttk.Combobox(chart_controls, textvariable=self.chart_var, 
                                   values=["Weight", "Calories", "Macros", "Goal vs Actual"], width=15)
         chart_combo.pack(side=tk.LEFT, padx=5)
-        chart_combo.bind('<<ComboboxSelected>>', lambda e: self.update_charts())
+        chart_combo.bind('<<ComboboxSelected>>', self._schedule_update_charts)
         
         # Chart frame
         self.chart_frame = ttk.Frame(charts_frame)
         self.chart_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        # Message shown instead of a chart; it is re-packed, never recreated
+        self._chart_message = ttk.Label(self.chart_frame, font=('Arial', 12))
+        self._shown_chart_widget = None
     
     def set_today(self):
         """Set the date to today"""
@@ -167,60 +267,59 @@ class CalorieTrackerGUI:
     
     def load_selected_day(self):
         """Load data for the selected day"""
-        try:
-            date_str = self.date_var.get()
-            datetime.strptime(date_str, "%Y-%m-%d")  # Validate date format
+        if is_valid_date(self.date_var.get()):
             self.refresh_current_day_info()
-        except ValueError:
+        else:
             messagebox.showerror("Error", "Please enter date in YYYY-MM-DD format")
     
     def refresh_current_day_info(self):
         """Refresh the current day information display"""
-        date_str = self.date_var.get()
+        info_text = self._format_day_info(self.date_var.get(), self._data_rev)
+        
+        # Skip the widget update if the text hasn't changed
+        if info_text != self._last_info_text:
+            self.info_label.config(text=info_text)
+            self._last_info_text = info_text
+    
+    def format_day_info(self, date_str, rev):
+        """Build the summary text for a date (rev only keys the cache)"""
         data = self.data_manager.get_day_data(date_str)
         
         if data is not None:
-            info_text = f"Date: {date_str}\n"
-            info_text += f"Calories: {data.get('Calories', 0)}\n"
-            info_text += f"Protein: {data.get('Protein', 0)}g | "
-            info_text += f"Carbs: {data.get('Carbs', 0)}g | "
-            info_text += f"Fat: {data.get('Fat', 0)}g\n"
-            info_text += f"Weight: {data.get('Weight', 'Not set')}"
-            if data.get('Weight') != 'Not set' and data.get('Weight'):
-                info_text += " lbs"
-            info_text += f" | Goal: {data.get('Calorie_Goal', 'Not set')}"
+            # Missing weight/goal values are NaN, the only value unequal to itself
+            weight = data.get('Weight')
+            goal = data.get('Calorie_Goal')
+            weight_set = weight is not None and weight == weight
+            weight_str = f"{weight:g}{' lbs' if weight else ''}" if weight_set else "Not set"
+            goal_str = f"{goal:g}" if goal is not None and goal == goal else "Not set"
+            
+            info_text = (f"Date: {date_str}\n"
+                         f"Calories: {data.get('Calories', 0):g}\n"
+                         f"Protein: {data.get('Protein', 0):g}g | "
+                         f"Carbs: {data.get('Carbs', 0):g}g | "
+                         f"Fat: {data.get('Fat', 0):g}g\n"
+                         f"Weight: {weight_str} | Goal: {goal_str}")
         else:
             info_text = f"Date: {date_str}\nNo data entered for this date"
         
-        self.info_label.config(text=info_text)
+        return info_text
     
     def update_data(self):
         """Update data for the selected date"""
         try:
             date_str = self.date_var.get()
             
-            # Get values from entry fields
+            # Get values from entry fields; the DataManager adds calories and
+            # macros to the day's totals and replaces weight and goal
             updates = {}
-            
-            # Handle additive fields (calories, macros)
-            for field in ['calories', 'protein', 'carbs', 'fat']:
+            for field in ENTRY_FIELDS:
                 value = self.entry_vars[field].get().strip()
-                if value:
-                    try:
-                        updates[field] = float(value)
-                    except ValueError:
-                        messagebox.showerror("Error", f"Invalid {field} value: {value}")
-                        return
-            
-            # Handle set fields (weight, goal)
-            for field in ['weight', 'goal']:
-                value = self.entry_vars[field].get().strip()
-                if value:
-                    try:
-                        updates[field] = float(value)
-                    except ValueError:
-                        messagebox.showerror("Error", f"Invalid {field} value: {value}")
-                        return
+                if not value:
+                    continue
+                if not _NUM_RE.fullmatch(value):
+                    messagebox.showerror("Error", f"Invalid {field} value: {value}")
+                    return
+                updates[field] = float(value)
             
             if not updates:
                 messagebox.showwarning("Warning", "No data to update")
@@ -230,10 +329,14 @@ class CalorieTrackerGUI:
             success = self.data_manager.update_day_data(date_str, updates)
             
             if success:
-                messagebox.showinfo("Success", "Data updated successfully!")
+                self.invalidate_data()
                 self.clear_fields()
                 self.refresh_current_day_info()
-                self.refresh_display()
+                self._refresh_single_row(date_str)
+                
+                # Repaint once with the new data before the modal dialog opens
+                self.root.update_idletasks()
+                messagebox.showinfo("Success", "Data updated successfully!")
             else:
                 messagebox.showerror("Error", "Failed to update data")
                 
@@ -245,69 +348,285 @@ class CalorieTrackerGUI:
         for var in self.entry_vars.values():
             var.set("")
     
+    def invalidate_data(self):
+        """Drop cached table data after the data has changed"""
+        self._data_rev += 1
+        self._cached_df = None
+    
+    def reload_display(self):
+        """Reload the data from disk and refresh the display"""
+        self.invalidate_data()
+        self._row_cache = {}
+        self.refresh_display()
+    
+    def get_display_data(self):
+        """Get all data sorted newest first, loading it only once per change"""
+        if self._cached_df is None:
+            self._cached_df = self.data_manager.get_all_data_sorted()
+        return self._cached_df
+    
     def refresh_display(self):
         """Refresh the data display"""
-        # Clear existing data
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
         # Load all data
-        df = self.data_manager.get_all_data()
+        df = self.get_display_data()
         
-        if df is not None and not df.empty:
-            # Sort by date (newest first)
-            df = df.sort_values('Date', ascending=False)
+        # Hide the columns while rebuilding so the table isn't laid out row by row
+        self.tree.configure(displaycolumns=())
+        try:
+            # Clear existing data in a single Tk call
+            items = self.tree.get_children()
+            if items:
+                self.tree.delete(*items)
+            self._row_iid_by_date = {}
+            
+            dates = df['Date'].tolist() if df is not None else []
+            
+            # Format only rows that aren't cached yet, whole columns at once
+            new_rows = [i for i, date_str in enumerate(dates) if date_str not in self._row_cache]
+            if new_rows:
+                subset = df.iloc[new_rows]
+                columns = [subset['Date'].tolist()]
+                columns += [format_column(subset[column].to_numpy(), fmt, missing)
+                            for column, fmt, missing in TABLE_FORMATS]
+                for values in zip(*columns):
+                    self._row_cache[values[0]] = values
+            
+            # Forget rows of dates that are gone
+            self._row_cache = {date_str: self._row_cache[date_str] for date_str in dates}
             
             # Add data to treeview
-            for _, row in df.iterrows():
-                values = (
-                    row['Date'],
-                    f"{row['Calories']:.0f}" if not pd.isna(row['Calories']) else "0",
-                    f"{row['Protein']:.1f}" if not pd.isna(row['Protein']) else "0.0",
-                    f"{row['Carbs']:.1f}" if not pd.isna(row['Carbs']) else "0.0",
-                    f"{row['Fat']:.1f}" if not pd.isna(row['Fat']) else "0.0",
-                    f"{row['Weight']:.1f}" if not pd.isna(row['Weight']) else "",
-                    f"{row['Calorie_Goal']:.0f}" if not pd.isna(row['Calorie_Goal']) else ""
-                )
-                self.tree.insert("", tk.END, values=values)
+            for date_str in dates:
+                self._row_iid_by_date[date_str] = self.tree.insert("", tk.END, values=self._row_cache[date_str])
+        finally:
+            self.tree.configure(displaycolumns="#all")
         
         # Also refresh current day info
         self.refresh_current_day_info()
     
+    def _refresh_single_row(self, date_str):
+        """Update or insert the table row of one date without rebuilding the table"""
+        data = self.data_manager.get_day_data(date_str)
+        iid = self._row_iid_by_date.get(date_str)
+        
+        if data is None:
+            if iid is not None:
+                self.tree.delete(iid)
+                del self._row_iid_by_date[date_str]
+            self._row_cache.pop(date_str, None)
+            return
+        
+        values = (date_str, *(format_value(data[column], fmt, missing)
+                              for column, fmt, missing in TABLE_FORMATS))
+        self._row_cache[date_str] = values
+        
+        if iid is not None:
+            self.tree.item(iid, values=values)
+        else:
+            # Rows are newest first, so the new row goes after every later date
+            position = sum(1 for other in self._row_iid_by_date if other > date_str)
+            self._row_iid_by_date[date_str] = self.tree.insert("", position, values=values)
+    
+    def _build_fig(self, chart_type, days, fig):
+        """Draw the selected chart into fig, returning None if there is no data"""
+        if chart_type == "Weight":
+            return self.visualizer.create_weight_chart(days, fig=fig)
+        elif chart_type == "Calories":
+            return self.visualizer.create_calorie_chart(days, fig=fig)
+        elif chart_type == "Macros":
+            return self.visualizer.create_macro_chart(days, fig=fig)
+        elif chart_type == "Goal vs Actual":
+            return self.visualizer.create_goal_comparison_chart(days, fig=fig)
+        return None
+    
+    def _chart_cache_file(self, chart_type, days):
+        """Get the disk cache path of a chart"""
+        name = f"{CHART_CACHE_VERSION}|{self.data_manager.filepath}|{chart_type}|{days}"
+        return os.path.join(CHART_CACHE_DIR, hashlib.sha1(name.encode()).hexdigest() + ".pkl")
+    
+    def _chart_cache_stamp(self):
+        """Get the stamp cached charts must match, or None if the data file can't be read
+        
+        Charts cover the last N days of the data file, so the stamp is today's
+        date and the file's modification time.
+        """
+        try:
+            return (datetime.now().strftime("%Y-%m-%d"), os.stat(self.data_manager.filepath).st_mtime_ns)
+        except OSError:
+            return None
+    
+    def _load_cached_chart(self, chart_type, days, stamp):
+        """Load a chart saved by an earlier session, or None if it is missing or stale"""
+        if stamp is None:
+            return None
+        try:
+            cache_file = self._chart_cache_file(chart_type, days)
+            with open(cache_file, 'rb') as f:
+                cached_stamp, fig = pickle.load(f)
+            return fig if cached_stamp == stamp else None
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Failed to load cached chart: %s", e)
+            return None
+    
+    def _save_cached_chart(self, chart_type, days, fig, stamp):
+        """Save a chart for later sessions, replacing the previous one for the same view
+        
+        stamp is taken before the chart read its data; if the file has changed
+        since, the chart may predate the change and is not saved.
+        """
+        if stamp is None or self._chart_cache_stamp() != stamp:
+            return
+        try:
+            cache_file = self._chart_cache_file(chart_type, days)
+            os.makedirs(CHART_CACHE_DIR, exist_ok=True)
+            temp_file = cache_file + ".tmp"
+            with open(temp_file, 'wb') as f:
+                pickle.dump((stamp, fig), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file, cache_file)
+        except Exception as e:
+            logger.warning("Failed to cache chart: %s", e)
+    
+    def _schedule_update_charts(self, event=None):
+        """Update the charts shortly, so a burst of selections only redraws once"""
+        if self._chart_after_id:
+            self.root.after_cancel(self._chart_after_id)
+        self._chart_after_id = self.root.after(150, self._do_update_charts)
+    
+    def _do_update_charts(self):
+        """Run the scheduled chart update"""
+        self._chart_after_id = None
+        self.update_charts()
+    
+    def _show_chart_widget(self, widget, **pack_options):
+        """Show a canvas or the message in the chart frame, hiding the one shown before"""
+        if widget is not self._shown_chart_widget:
+            if self._shown_chart_widget is not None:
+                self._shown_chart_widget.pack_forget()
+            widget.pack(**pack_options)
+            self._shown_chart_widget = widget
+    
+    def _show_chart_message(self, text):
+        """Show a message in place of the chart"""
+        self._chart_message.config(text=text)
+        self._show_chart_widget(self._chart_message, expand=True)
+    
     def update_charts(self):
         """Update the charts display"""
         try:
             days = int(self.days_var.get())
             chart_type = self.chart_var.get()
+            self._chart_request_id += 1
             
-            # Clear existing chart
-            for widget in self.chart_frame.winfo_children():
-                widget.destroy()
-            
-            # Create new chart based on selection
-            if chart_type == "Weight":
-                fig = self.visualizer.create_weight_chart(days)
-            elif chart_type == "Calories":
-                fig = self.visualizer.create_calorie_chart(days)
-            elif chart_type == "Macros":
-                fig = self.visualizer.create_macro_chart(days)
-            elif chart_type == "Goal vs Actual":
-                fig = self.visualizer.create_goal_comparison_chart(days)
-            else:
+            # Show the chart right away if it already shows these days and data
+            canvas = self._chart_canvases.get(chart_type)
+            key = (days, self._data_rev)
+            if canvas and self._chart_keys.get(chart_type) == key:
+                self._show_chart_widget(canvas.get_tk_widget(), fill=tk.BOTH, expand=True)
                 return
             
-            if fig:
-                # Embed the chart in the GUI
-                canvas = FigureCanvasTkAgg(fig, self.chart_frame)
-                canvas.draw()
-                canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-            else:
-                ttk.Label(self.chart_frame, text="No data available for the selected period", 
-                         font=('Arial', 12)).pack(expand=True)
+            # Otherwise build it on the worker thread, keeping the canvas hidden
+            # while its figure is redrawn; if that figure is already being
+            # built for an earlier request, draw into a fresh one instead
+            self._chart_keys[chart_type] = None
+            self._show_chart_message("Loading…")
+            builds = self._chart_builds.get(chart_type, 0)
+            fig = canvas.figure if canvas and not builds else None
+            self._chart_requests.put((self._chart_request_id, chart_type, days, key, fig))
+            self._chart_latest[chart_type] = self._chart_request_id
+            self._chart_builds[chart_type] = builds + 1
+            self._charts_pending += 1
+            
+            if self._chart_worker is None:
+                self._chart_worker = threading.Thread(target=self._chart_worker_loop, daemon=True)
+                self._chart_worker.start()
+            if self._charts_pending == 1:
+                self.root.after(50, self._poll_chart_results)
                 
         except Exception as e:
             messagebox.showerror("Chart Error", f"Failed to create chart: {str(e)}")
-
-
-# Import pandas here to avoid circular imports
-import pandas as pd
\ No newline at end of file
+    
+    def _chart_worker_loop(self):
+        """Build requested charts one at a time, off the Tk thread"""
+        while True:
+            request_id, chart_type, days, key, fig = self._chart_requests.get()
+            try:
+                result = self._build_chart(chart_type, days, fig)
+            except Exception as e:
+                result = e
+            self._chart_results.put((request_id, chart_type, key, result))
+    
+    def _build_chart(self, chart_type, days, fig):
+        """Draw a chart into fig, or get or create the figure if there is none yet"""
+        # Stamp the chart with the data file as it is before the chart reads it
+        stamp = self._chart_cache_stamp()
+        
+        if fig is None:
+            # The first time a chart is shown, reuse it from an earlier
+            # session if the data file hasn't changed since
+            cached = self._load_cached_chart(chart_type, days, stamp)
+            if cached is not None:
+                return cached
+            
+            from matplotlib.figure import Figure
+            fig = Figure(figsize=(10, 6))
+        
+        fig = self._build_fig(chart_type, days, fig)
+        if fig:
+            self._save_cached_chart(chart_type, days, fig, stamp)
+        return fig
+    
+    def _poll_chart_results(self):
+        """Handle finished charts, polling again while builds are outstanding"""
+        try:
+            while True:
+                try:
+                    request_id, chart_type, key, result = self._chart_results.get_nowait()
+                except queue.Empty:
+                    break
+                self._charts_pending -= 1
+                self._chart_builds[chart_type] -= 1
+                self._finish_chart(request_id, chart_type, key, result)
+        finally:
+            # Keep polling even if handling a result failed, or later
+            # requests would never be picked up
+            if self._charts_pending:
+                self.root.after(50, self._poll_chart_results)
+    
+    def _finish_chart(self, request_id, chart_type, key, result):
+        """Attach a built chart to its canvas and display it if it is still wanted"""
+        # A newer request for this chart type supersedes the result: it is
+        # neither drawn nor keyed, as its figure may be getting redrawn
+        if request_id != self._chart_latest.get(chart_type):
+            return
+        latest = request_id == self._chart_request_id
+        
+        if isinstance(result, Exception):
+            if latest:
+                self._show_chart_message("No data available for the selected period")
+                messagebox.showerror("Chart Error", f"Failed to create chart: {str(result)}")
+            return
+        
+        fig = result
+        self._chart_keys[chart_type] = key if fig else None
+        canvas = self._chart_canvases.get(chart_type)
+        
+        if fig:
+            # Tk widgets are created on this thread; a new figure (e.g. loaded
+            # from the disk cache) replaces the canvas of an older one
+            if canvas is None or canvas.figure is not fig:
+                from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+                
+                if canvas is not None:
+                    if canvas.get_tk_widget() is self._shown_chart_widget:
+                        self._shown_chart_widget = None
+                    canvas.get_tk_widget().destroy()
+                canvas = FigureCanvasTkAgg(fig, self.chart_frame)
+                self._chart_canvases[chart_type] = canvas
+            canvas.draw()
+        
+        if latest:
+            if fig:
+                self._show_chart_widget(canvas.get_tk_widget(), fill=tk.BOTH, expand=True)
+            else:
+                self._show_chart_message("No data available for the selected period")
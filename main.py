@@ -6,21 +6,40 @@ Main entry point for the application
 
 import tkinter as tk
 from tkinter import messagebox
+import argparse
 import sys
 import os
+import logging
 
 # Add the current directory to Python path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-try:
-    from gui import CalorieTrackerGUI
-except ImportError as e:
-    messagebox.showerror("Import Error", f"Failed to import required modules: {str(e)}")
-    sys.exit(1)
+from config import APP_NAME, APP_VERSION, LOG_LEVEL, LOG_FORMAT
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description=f"{APP_NAME}: track daily calories, macros, weight and calorie goals"
+    )
+    parser.add_argument("--version", action="version", version=f"{APP_NAME} {APP_VERSION}")
+    return parser.parse_args()
 
 
 def main():
     """Main application entry point"""
+    # Handle --help/--version before loading the GUI modules
+    parse_args()
+    
+    # Configure logging once for the whole application
+    logging.basicConfig(level=LOG_LEVEL, format=LOG_FORMAT)
+    
+    try:
+        from gui import CalorieTrackerGUI
+    except ImportError as e:
+        messagebox.showerror("Import Error", f"Failed to import required modules: {str(e)}")
+        sys.exit(1)
+    
     try:
         # Create the main window
         root = tk.Tk()
@@ -1,5 +1,7 @@
 import anthropic
 from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import os
 
 load_dotenv()
@@ -24,29 +26,46 @@ tools = [
                 }
             },
             "required": ["path", "content"]
-        }
+        },
+        # Cache the tool definitions so later turns don't pay for them again
+        "cache_control": {"type": "ephemeral"}
     }
 ]
 
 created_files = []
+_created_files_lock = threading.Lock()
+
+# Tool calls from one response are independent file writes, so they run in parallel
+_pool = ThreadPoolExecutor(max_workers=8)
+
+# Directories already created this run, so makedirs isn't repeated per file
+_MADE_DIRS = set()
 
 def execute_tool(tool_name, tool_input):
     """Execute the requested tool"""
     if tool_name == "create_file":
-        path = tool_input['path']
-        content = tool_input['content']
+        path = tool_input.get('path', 'unknown')
         
         try:
+            content = tool_input['content']
+            
             # Create directory if needed
             directory = os.path.dirname(path)
-            if directory:
+            if directory and directory not in _MADE_DIRS:
                 os.makedirs(directory, exist_ok=True)
+                _MADE_DIRS.add(directory)
             
-            # Write file
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # Write file with a raw descriptor, skipping the text I/O layer
+            data = memoryview(content.encode('utf-8'))
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+            try:
+                while data:
+                    data = data[os.write(fd, data):]
+            finally:
+                os.close(fd)
             
-            created_files.append(path)
+            with _created_files_lock:
+                created_files.append(path)
             file_size = len(content)
             return f"Successfully created {path} ({file_size} characters)"
         
@@ -55,13 +74,48 @@ def execute_tool(tool_name, tool_input):
     
     return f"Unknown tool: {tool_name}"
 
+def start_tool_call(block):
+    """Run a complete tool_use block on the pool, returning its id and future"""
+    print(f"🔧 Creating: {block.input.get('path', 'unknown')}")
+    return block.id, _pool.submit(execute_tool, block.name, block.input)
+
+def block_type(block):
+    """Get the type of a content block (API object or dict)"""
+    return block["type"] if isinstance(block, dict) else block.type
+
+def compact_history(messages):
+    """Replace already-answered tool calls and results with short text notes
+    
+    The file contents sent in earlier create_file calls are by far the largest
+    part of the conversation, and Claude only needs to know which files exist.
+    """
+    for message in messages[1:]:
+        if isinstance(message["content"], str):
+            continue
+        
+        compacted = []
+        for block in message["content"]:
+            kind = block_type(block)
+            if kind == "tool_use":
+                path = block.input.get('path', 'unknown')
+                compacted.append({"type": "text", "text": f"(previous tool call omitted: create_file {path})"})
+            elif kind == "tool_result":
+                compacted.append({"type": "text", "text": block["content"]})
+            elif kind not in ("thinking", "redacted_thinking"):
+                compacted.append(block)
+        message["content"] = compacted or [{"type": "text", "text": "(omitted)"}]
+
 # Load prompt
 with open('calorie_tracker_prompt.txt', 'r', encoding='utf-8') as f:
     prompt = f.read()
 
+# The first message is the same on every turn, so it is cached as a prefix
 messages = [{
     "role": "user",
-    "content": f"""{prompt}
+    "content": [{
+        "type": "text",
+        "cache_control": {"type": "ephemeral"},
+        "text": f"""{prompt}
 
 You have access to a create_file tool. Use it to create ALL necessary files for the Calorie Tracker application.
 
@@ -70,6 +124,7 @@ Important:
 2. Include complete, working code in each file
 3. After creating all files, send a final message confirming completion
 4. Do not output code in markdown - only use the create_file tool"""
+    }]
 }]
 
 print("🤖 Claude is building the Calorie Tracker...\n")
@@ -81,8 +136,12 @@ iteration = 0
 while iteration < max_iterations:
     iteration += 1
     
+    # Stream the response so each tool call runs as soon as its block is
+    # complete, while Claude is still generating the rest of the turn
+    tool_calls = []
+    held_tool_use = None
     try:
-        response = client.messages.create(
+        with client.messages.stream(
             model="claude-sonnet-4-20250514",
             max_tokens=8000,
             thinking={
@@ -91,15 +150,45 @@ while iteration < max_iterations:
             },
             tools=tools,
             messages=messages
-        )
+        ) as stream:
+            for event in stream:
+                # A tool_use block is only known to be complete once another
+                # block starts or the response stops to use tools; one cut off
+                # at max_tokens has partial input and is never run
+                if event.type == "content_block_start" or (
+                        event.type == "message_delta" and event.delta.stop_reason == "tool_use"):
+                    if held_tool_use is not None:
+                        tool_calls.append(start_tool_call(held_tool_use))
+                        held_tool_use = None
+                    continue
+                
+                if event.type != "content_block_stop":
+                    continue
+                block = stream.current_message_snapshot.content[event.index]
+                
+                # Print thinking if present
+                if block.type == "thinking":
+                    print(f"[Claude is thinking: {block.thinking[:100]}...]")
+                
+                elif block.type == "tool_use":
+                    # Execute the tool on the pool once the block is known to be complete
+                    held_tool_use = block
+            
+            response = stream.get_final_message()
     except Exception as e:
         print(f"❌ API Error: {e}")
         break
     
-    # Print thinking if present
-    for block in response.content:
-        if block.type == "thinking":
-            print(f"[Claude is thinking: {block.thinking[:100]}...]")
+    # Collect tool results in call order to send back to Claude
+    tool_results = []
+    for tool_use_id, future in tool_calls:
+        result = future.result()
+        print(f"   {result}")
+        tool_results.append({
+            "type": "tool_result",
+            "tool_use_id": tool_use_id,
+            "content": result
+        })
     
     # Check stop reason
     if response.stop_reason == "end_turn":
@@ -110,26 +199,12 @@ while iteration < max_iterations:
         break
     
     elif response.stop_reason == "tool_use":
+        # Earlier tool calls have been answered; keep only a note of them
+        compact_history(messages)
+        
         # Add assistant's response to conversation
         messages.append({"role": "assistant", "content": response.content})
         
-        # Extract and execute tool calls
-        tool_results = []
-        for block in response.content:
-            if block.type == "tool_use":
-                print(f"🔧 Creating: {block.input.get('path', 'unknown')}")
-                
-                # Execute the tool
-                result = execute_tool(block.name, block.input)
-                print(f"   {result}")
-                
-                # Store result to send back to Claude
-                tool_results.append({
-                    "type": "tool_result",
-                    "tool_use_id": block.id,
-                    "content": result
-                })
-        
         # Send tool results back to Claude
         messages.append({"role": "user", "content": tool_results})
     
@@ -3,30 +3,208 @@ Visualizer module for the Calorie Tracker application
 Handles all chart creation and data visualization
 """
 
-import matplotlib.pyplot as plt
+import matplotlib
+# Charts are rendered off-screen (and embedded by the caller), so no
+# interactive backend or pyplot figure manager is needed
+matplotlib.use('Agg')
 import matplotlib.dates as mdates
+from matplotlib import style
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, date
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import threading
 import numpy as np
 import logging
+import time
 
 # Configure matplotlib for GUI embedding
-plt.style.use('default')
-plt.rcParams.update({'font.size': 10})
+style.use('default')
+matplotlib.rcParams.update({'font.size': 10})
 
 logger = logging.getLogger(__name__)
 
+# Recent data is shared between charts for this long unless it changes, so
+# drawing several charts loads and parses it once
+DATA_CACHE_TTL = 5.0  # seconds
+
+# Number of finished figures kept for repeat calls with the same arguments
+FIGURE_CACHE_SIZE = 8
+
+# Charts drawn by create_all_charts: name -> method
+ALL_CHARTS = {
+    'Weight': 'create_weight_chart',
+    'Calories': 'create_calorie_chart',
+    'Macros': 'create_macro_chart',
+    'Goal vs Actual': 'create_goal_comparison_chart',
+    'Weekly Summary': 'create_weekly_summary_chart',
+    'Macro Distribution': 'create_macro_pie_chart',
+}
+
+# Columns the charts read; other stored columns are left out of the shared frame
+CHART_COLUMNS = ['Date', 'Calories', 'Protein', 'Carbs', 'Fat', 'Weight', 'Calorie_Goal']
+
+# Columns averaged per week by the weekly summary chart
+WEEKLY_COLUMNS = ['Calories', 'Weight', 'Protein', 'Carbs', 'Fat']
+
+
+def _bin_and_aggregate(bins, values):
+    """Average each column of values over the rows sharing a bin, skipping NaN
+    
+    Returns the sorted unique bins and a (bins x columns) array of means;
+    a bin with no values in a column gets NaN, as with pandas' mean.
+    """
+    keys, inverse = np.unique(bins, return_inverse=True)
+    present = ~np.isnan(values)
+    filled = np.where(present, values, 0.0)
+    
+    sums = np.empty((len(keys), values.shape[1]))
+    counts = np.empty_like(sums)
+    for col in range(values.shape[1]):
+        sums[:, col] = np.bincount(inverse, weights=filled[:, col], minlength=len(keys))
+        counts[:, col] = np.bincount(inverse, weights=present[:, col], minlength=len(keys))
+    
+    with np.errstate(invalid='ignore'):
+        return keys, sums / counts
+
+
+def _draw_bars(ax, x, heights, width, colors, alpha, label=None):
+    """Draw bars from 0 as a single PolyCollection instead of one Rectangle artist per bar"""
+    half = width / 2
+    verts = np.zeros((len(x), 4, 2))
+    verts[:, 0:2, 0] = (x - half)[:, None]
+    verts[:, 2:4, 0] = (x + half)[:, None]
+    verts[:, 1:3, 1] = heights[:, None]
+    
+    bars = PolyCollection(verts, facecolors=colors, edgecolors=colors, alpha=alpha, label=label)
+    # Keep the bars sitting on the x-axis, as ax.bar does
+    bars.sticky_edges.y.append(0)
+    ax.add_collection(bars)
+    ax.autoscale_view()
+    return bars
+
+
+def _format_date_axis(ax, days):
+    """Label a date x-axis as mm/dd with about ten rotated ticks over the period
+    
+    Each axis gets its own formatter and locator: matplotlib binds them to the
+    axis they are set on, so one shared instance would tick every chart using
+    whichever axis it was attached to last.
+    """
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
+    ax.xaxis.set_major_locator(mdates.DayLocator(interval=max(1, days//10)))
+    ax.tick_params(axis='x', labelrotation=45)
+
+
+def cached_figure(method):
+    """Return the figure from an earlier call with the same arguments while the data is unchanged
+    
+    Once the data changes, the same figure is redrawn in place, so each chart
+    keeps one persistent Figure. Only figures the visualizer creates itself
+    are cached; a call that draws into the caller's own figure always redraws it.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, fig=None, **kwargs):
+        if fig is not None:
+            return method(self, *args, fig=fig, **kwargs)
+        
+        # "Last N days" also moves with the date, not only with new entries
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        token = (self.data_manager.data_version, date.today())
+        
+        # While a stale figure is being redrawn it is out of the cache, so a
+        # concurrent call for the same chart draws into a new figure instead
+        with self._lock:
+            cached = self._figures.pop(key, None)
+            if cached and cached[0] == token:
+                self._figures[key] = cached
+                return cached[1]
+        
+        fig = method(self, *args, fig=cached[1] if cached else None, **kwargs)
+        if fig is not None:
+            with self._lock:
+                self._figures[key] = (token, fig)
+                while len(self._figures) > FIGURE_CACHE_SIZE:
+                    self._figures.popitem(last=False)
+        return fig
+    
+    return wrapper
+
 
 class Visualizer:
     def __init__(self, data_manager):
         """Initialize the visualizer with a data manager"""
         self.data_manager = data_manager
+        
+        # days -> (load time, data version, frame with parsed dates)
+        self._cache = {}
+        
+        # strptime format of the stored dates, detected from the first frame
+        self._date_fmt = None
+        
+        # (method, arguments) -> ((data version, day), figure), least recently used first
+        self._figures = OrderedDict()
+        
+        # Guards the caches above when charts are drawn from several threads
+        self._lock = threading.RLock()
+    
+    def _get_df(self, days):
+        """Get the last N days of data with parsed dates, shared between charts
+        
+        The frame is reused while the data is unchanged, for at most
+        DATA_CACHE_TTL seconds. Treat it as read-only.
+        """
+        # Held while loading, so charts drawn concurrently load each period once
+        with self._lock:
+            now = time.monotonic()
+            cached = self._cache.get(days)
+            if cached and cached[1] == self.data_manager.data_version and now - cached[0] < DATA_CACHE_TTL:
+                return cached[2]
+            
+            df = self.data_manager.get_recent_data(days, columns=CHART_COLUMNS)
+            if not df.empty:
+                df['Date'] = self._parse_dates(df['Date'])
+            
+            self._cache[days] = (now, self.data_manager.data_version, df)
+            return df
+    
+    def _parse_dates(self, dates):
+        """Parse date strings with an explicit format (pandas' fast path)"""
+        if self._date_fmt is None:
+            # Dates written by the app are YYYY-MM-DD; spreadsheets edited by
+            # hand may hold full timestamps
+            try:
+                datetime.strptime(dates.iloc[0], '%Y-%m-%d')
+                self._date_fmt = '%Y-%m-%d'
+            except ValueError:
+                self._date_fmt = 'ISO8601'
+        
+        try:
+            return pd.to_datetime(dates, format=self._date_fmt, cache=True)
+        except ValueError:
+            # Mixed formats; fall back to the general ISO 8601 parser
+            self._date_fmt = 'ISO8601'
+            return pd.to_datetime(dates, format=self._date_fmt, cache=True)
     
-    def create_weight_chart(self, days=30):
+    def _prepare_figure(self, fig, figsize, nrows=1, ncols=1):
+        """Create a new figure, or clear the given one for reuse, and add its axes"""
+        if fig is None:
+            # A plain Figure isn't tracked by pyplot, so it is freed like any
+            # other object once the caller drops it
+            fig = Figure(figsize=figsize)
+        else:
+            fig.clear()
+        return fig, fig.subplots(nrows, ncols)
+    
+    @cached_figure
+    def create_weight_chart(self, days=30, fig=None):
         """Create a weight progression chart"""
         try:
             # Get recent data
-            df = self.data_manager.get_recent_data(days)
+            df = self._get_df(days)
             
             if df.empty:
                 return None
@@ -38,11 +216,10 @@ class Visualizer:
                 return None
             
             # Create the figure
-            fig, ax = plt.subplots(figsize=(10, 6))
+            fig, ax = self._prepare_figure(fig, (10, 6))
             
-            # Convert dates to datetime
-            dates = pd.to_datetime(weight_data['Date'])
-            weights = weight_data['Weight']
+            dates = weight_data['Date'].to_numpy()
+            weights = weight_data['Weight'].to_numpy(dtype=np.float64)
             
             # Plot the line chart
             ax.plot(dates, weights, marker='o', linewidth=2, markersize=6, color='blue')
@@ -54,49 +231,56 @@ class Visualizer:
             ax.grid(True, alpha=0.3)
             
             # Format x-axis dates
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
-            ax.xaxis.set_major_locator(mdates.DayLocator(interval=max(1, days//10)))
-            plt.xticks(rotation=45)
+            _format_date_axis(ax, days)
             
             # Add trend line if we have enough data points
-            if len(weight_data) >= 3:
-                x_numeric = np.arange(len(dates))
-                z = np.polyfit(x_numeric, weights, 1)
-                trend_line = np.poly1d(z)
-                ax.plot(dates, trend_line(x_numeric), '--', alpha=0.7, color='red', label='Trend')
+            if len(weights) >= 3:
+                # Closed-form least-squares line (no Vandermonde/LAPACK setup)
+                x = np.arange(len(weights), dtype=np.float64)
+                y = weights
+                x_dev = x - x.mean()
+                slope = (x_dev * (y - y.mean())).sum() / (x_dev * x_dev).sum()
+                trend = y.mean() + slope * x_dev
+                ax.plot(dates, trend, '--', alpha=0.7, color='red', label='Trend')
                 ax.legend()
             
-            plt.tight_layout()
+            fig.tight_layout()
             return fig
             
         except Exception as e:
-            logger.error(f"Failed to create weight chart: {str(e)}")
+            logger.error("Failed to create weight chart: %s", e)
             return None
     
-    def create_calorie_chart(self, days=30):
+    @cached_figure
+    def create_calorie_chart(self, days=30, fig=None):
         """Create a calorie intake chart"""
         try:
             # Get recent data
-            df = self.data_manager.get_recent_data(days)
+            df = self._get_df(days)
             
             if df.empty:
                 return None
             
-            # Filter out rows without calorie data
-            calorie_data = df[df['Calories'] > 0]
+            # Filter out rows without calorie data (masking the arrays, not the frame)
+            calories = df['Calories'].to_numpy(dtype=np.float64)
+            has_calories = calories > 0
             
-            if calorie_data.empty:
+            if not has_calories.any():
                 return None
             
             # Create the figure
-            fig, ax = plt.subplots(figsize=(10, 6))
+            fig, ax = self._prepare_figure(fig, (10, 6))
+            
+            dates = df['Date'].to_numpy()[has_calories]
+            calories = calories[has_calories]
             
-            # Convert dates to datetime
-            dates = pd.to_datetime(calorie_data['Date'])
-            calories = calorie_data['Calories']
+            # Color bars based on calorie ranges
+            colors = np.where(calories < 1200, 'red',
+                              np.where(calories > 2500, 'orange', 'green'))
             
             # Create bar chart
-            bars = ax.bar(dates, calories, alpha=0.7, color='green', width=0.8)
+            ax.xaxis_date()
+            _draw_bars(ax, mdates.date2num(dates), calories, 0.8, colors, alpha=0.7)
             
             # Customize the chart
             ax.set_title(f'Daily Calorie Intake - Last {days} Days', fontsize=14, fontweight='bold')
@@ -105,9 +289,7 @@ class Visualizer:
             ax.grid(True, alpha=0.3, axis='y')
             
             # Format x-axis dates
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
-            ax.xaxis.set_major_locator(mdates.DayLocator(interval=max(1, days//10)))
-            plt.xticks(rotation=45)
+            _format_date_axis(ax, days)
             
             # Add average line
             avg_calories = calories.mean()
@@ -115,57 +297,43 @@ class Visualizer:
                       label=f'Average: {avg_calories:.0f} cal')
             ax.legend()
             
-            # Color bars based on calorie ranges
-            for i, bar in enumerate(bars):
-                cal_value = calories.iloc[i]
-                if cal_value < 1200:
-                    bar.set_color('red')
-                elif cal_value > 2500:
-                    bar.set_color('orange')
-                else:
-                    bar.set_color('green')
-            
-            plt.tight_layout()
+            fig.tight_layout()
             return fig
             
         except Exception as e:
-            logger.error(f"Failed to create calorie chart: {str(e)}")
+            logger.error("Failed to create calorie chart: %s", e)
             return None
     
-    def create_macro_chart(self, days=30):
+    @cached_figure
+    def create_macro_chart(self, days=30, fig=None):
         """Create a macro nutrients chart"""
         try:
             # Get recent data
-            df = self.data_manager.get_recent_data(days)
+            df = self._get_df(days)
             
             if df.empty:
                 return None
             
-            # Filter out rows without macro data
-            macro_data = df.dropna(subset=['Protein', 'Carbs', 'Fat'], how='all')
-            macro_data = macro_data[
-                (macro_data['Protein'] > 0) | 
-                (macro_data['Carbs'] > 0) | 
-                (macro_data['Fat'] > 0)
-            ]
+            # Keep rows with any macro data (NaN compares False, so one mask
+            # also drops the all-missing rows)
+            macros = df[['Protein', 'Carbs', 'Fat']].to_numpy(dtype=float)
+            has_macros = (macros > 0).any(axis=1)
             
-            if macro_data.empty:
+            if not has_macros.any():
                 return None
             
             # Create the figure
-            fig, ax = plt.subplots(figsize=(10, 6))
+            fig, ax = self._prepare_figure(fig, (10, 6))
             
-            # Convert dates to datetime
-            dates = pd.to_datetime(macro_data['Date'])
+            dates = df['Date'].to_numpy()[has_macros]
+            
+            # Stack boundaries (protein, protein+carbs, protein+carbs+fat) in one pass
+            stacks = np.cumsum(macros[has_macros], axis=1)
             
             # Plot stacked area chart
-            ax.fill_between(dates, 0, macro_data['Protein'], alpha=0.7, color='red', label='Protein')
-            ax.fill_between(dates, macro_data['Protein'], 
-                           macro_data['Protein'] + macro_data['Carbs'], 
-                           alpha=0.7, color='blue', label='Carbohydrates')
-            ax.fill_between(dates, macro_data['Protein'] + macro_data['Carbs'],
-                           macro_data['Protein'] + macro_data['Carbs'] + macro_data['Fat'],
-                           alpha=0.7, color='orange', label='Fat')
+            ax.fill_between(dates, 0, stacks[:, 0], alpha=0.7, color='red', label='Protein')
+            ax.fill_between(dates, stacks[:, 0], stacks[:, 1], alpha=0.7, color='blue', label='Carbohydrates')
+            ax.fill_between(dates, stacks[:, 1], stacks[:, 2], alpha=0.7, color='orange', label='Fat')
             
             # Customize the chart
             ax.set_title(f'Macro Nutrients - Last {days} Days', fontsize=14, fontweight='bold')
@@ -175,58 +343,51 @@ class Visualizer:
             ax.legend()
             
             # Format x-axis dates
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
-            ax.xaxis.set_major_locator(mdates.DayLocator(interval=max(1, days//10)))
-            plt.xticks(rotation=45)
+            _format_date_axis(ax, days)
             
-            plt.tight_layout()
+            fig.tight_layout()
             return fig
             
         except Exception as e:
-            logger.error(f"Failed to create macro chart: {str(e)}")
+            logger.error("Failed to create macro chart: %s", e)
             return None
     
-    def create_goal_comparison_chart(self, days=30):
+    @cached_figure
+    def create_goal_comparison_chart(self, days=30, fig=None):
         """Create a goal vs actual calorie comparison chart"""
         try:
             # Get recent data
-            df = self.data_manager.get_recent_data(days)
+            df = self._get_df(days)
             
             if df.empty:
                 return None
             
-            # Filter out rows without both calories and goals
-            goal_data = df.dropna(subset=['Calories', 'Calorie_Goal'])
-            goal_data = goal_data[
-                (goal_data['Calories'] > 0) & 
-                (goal_data['Calorie_Goal'] > 0)
-            ]
+            # Filter out rows without both calories and goals (NaN compares
+            # False, so missing values drop out too)
+            actual = df['Calories'].to_numpy(dtype=np.float64)
+            goals = df['Calorie_Goal'].to_numpy(dtype=np.float64)
+            has_goal = (actual > 0) & (goals > 0)
             
-            if goal_data.empty:
+            if not has_goal.any():
                 return None
             
             # Create the figure
-            fig, ax = plt.subplots(figsize=(10, 6))
+            fig, ax = self._prepare_figure(fig, (10, 6))
             
-            # Convert dates to datetime
-            dates = pd.to_datetime(goal_data['Date'])
-            actual = goal_data['Calories']
-            goals = goal_data['Calorie_Goal']
+            dates = df.loc[has_goal, 'Date']
+            actual = actual[has_goal]
+            goals = goals[has_goal]
             
             # Create bar chart comparing actual vs goal
             x = np.arange(len(dates))
             width = 0.35
             
-            bars1 = ax.bar(x - width/2, actual, width, label='Actual Calories', alpha=0.8)
-            bars2 = ax.bar(x + width/2, goals, width, label='Calorie Goal', alpha=0.8)
+            # Color actual bars green where the goal was met, red where not
+            met = actual >= goals
+            colors = np.where(met, 'green', 'red')
             
-            # Color bars based on goal achievement
-            for i, (bar1, bar2) in enumerate(zip(bars1, bars2)):
-                if actual.iloc[i] >= goals.iloc[i]:
-                    bar1.set_color('green')  # Goal met
-                else:
-                    bar1.set_color('red')    # Goal not met
-                bar2.set_color('blue')
+            _draw_bars(ax, x - width/2, actual, width, colors, alpha=0.8, label='Actual Calories')
+            _draw_bars(ax, x + width/2, goals, width, 'blue', alpha=0.8, label='Calorie Goal')
             
             # Customize the chart
             ax.set_title(f'Calorie Goal vs Actual - Last {days} Days', fontsize=14, fontweight='bold')
@@ -236,127 +397,139 @@ class Visualizer:
             ax.legend()
             
             # Set x-axis labels
-            date_labels = [date.strftime('%m/%d') for date in dates]
+            date_labels = dates.dt.strftime('%m/%d')
             ax.set_xticks(x)
             ax.set_xticklabels(date_labels, rotation=45)
             
             # Add success rate text
-            success_rate = (actual >= goals).mean() * 100
+            success_rate = np.count_nonzero(met) * 100.0 / met.size
             ax.text(0.02, 0.98, f'Goal Achievement Rate: {success_rate:.1f}%', 
                    transform=ax.transAxes, verticalalignment='top',
                    bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
             
-            plt.tight_layout()
+            fig.tight_layout()
             return fig
             
         except Exception as e:
-            logger.error(f"Failed to create goal comparison chart: {str(e)}")
+            logger.error("Failed to create goal comparison chart: %s", e)
             return None
     
-    def create_weekly_summary_chart(self, weeks=4):
+    @cached_figure
+    def create_weekly_summary_chart(self, weeks=4, fig=None):
         """Create a weekly summary chart"""
         try:
             # Get recent data
             days = weeks * 7
-            df = self.data_manager.get_recent_data(days)
+            df = self._get_df(days)
             
             if df.empty:
                 return None
             
-            # Convert date to datetime
-            df['Date'] = pd.to_datetime(df['Date'])
-            
-            # Group by week
-            df['Week'] = df['Date'].dt.isocalendar().week
-            df['Year'] = df['Date'].dt.year
+            # Bin days into Monday-based weeks (1970-01-01 was a Thursday)
+            day_numbers = df['Date'].to_numpy(dtype='datetime64[D]').astype(np.int64)
+            week_bins = (day_numbers + 3) // 7
             
             # Calculate weekly averages
-            weekly_data = df.groupby(['Year', 'Week']).agg({
-                'Calories': 'mean',
-                'Weight': 'mean',
-                'Protein': 'mean',
-                'Carbs': 'mean',
-                'Fat': 'mean'
-            }).reset_index()
-            
-            if weekly_data.empty:
+            week_keys, means = _bin_and_aggregate(week_bins, df[WEEKLY_COLUMNS].to_numpy(dtype=np.float64))
+            
+            if len(week_keys) == 0:
                 return None
             
+            calories, weight, protein, carbs, fat = means.T
+            
             # Create the figure with subplots
-            fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(12, 8))
+            fig, ((ax1, ax2), (ax3, ax4)) = self._prepare_figure(fig, (12, 8), 2, 2)
             
-            weeks_labels = [f"W{w}" for w in weekly_data['Week']]
+            # Label each week with the ISO week number of its Monday
+            week_starts = pd.DatetimeIndex((week_keys * 7 - 3).astype('datetime64[D]'))
+            weeks_labels = week_starts.strftime('W%V')
             
             # Weekly calories
-            ax1.bar(weeks_labels, weekly_data['Calories'], color='green', alpha=0.7)
+            ax1.bar(weeks_labels, calories, color='green', alpha=0.7)
             ax1.set_title('Weekly Average Calories')
             ax1.set_ylabel('Calories')
             
             # Weekly weight
-            if not weekly_data['Weight'].isna().all():
-                ax2.plot(weeks_labels, weekly_data['Weight'], marker='o', color='blue')
+            if not np.isnan(weight).all():
+                ax2.plot(weeks_labels, weight, marker='o', color='blue')
                 ax2.set_title('Weekly Average Weight')
                 ax2.set_ylabel('Weight (lbs)')
             
             # Weekly protein
-            ax3.bar(weeks_labels, weekly_data['Protein'], color='red', alpha=0.7)
+            ax3.bar(weeks_labels, protein, color='red', alpha=0.7)
             ax3.set_title('Weekly Average Protein')
             ax3.set_ylabel('Grams')
             
             # Weekly carbs vs fat
-            ax4.bar(weeks_labels, weekly_data['Carbs'], alpha=0.7, label='Carbs')
-            ax4.bar(weeks_labels, weekly_data['Fat'], alpha=0.7, bottom=weekly_data['Carbs'], label='Fat')
+            ax4.bar(weeks_labels, carbs, alpha=0.7, label='Carbs')
+            ax4.bar(weeks_labels, fat, alpha=0.7, bottom=carbs, label='Fat')
             ax4.set_title('Weekly Carbs vs Fat')
             ax4.set_ylabel('Grams')
             ax4.legend()
             
-            plt.tight_layout()
+            fig.tight_layout()
             return fig
             
         except Exception as e:
-            logger.error(f"Failed to create weekly summary chart: {str(e)}")
+            logger.error("Failed to create weekly summary chart: %s", e)
             return None
     
-    def create_macro_pie_chart(self, days=7):
+    @cached_figure
+    def create_macro_pie_chart(self, days=7, fig=None):
         """Create a pie chart showing macro nutrient distribution"""
         try:
             # Get recent data
-            df = self.data_manager.get_recent_data(days)
+            df = self._get_df(days)
             
             if df.empty:
                 return None
             
             # Calculate total macros
-            total_protein = df['Protein'].sum()
-            total_carbs = df['Carbs'].sum()
-            total_fat = df['Fat'].sum()
+            totals = np.nansum(df[['Protein', 'Carbs', 'Fat']].to_numpy(dtype=np.float64), axis=0)
             
-            if total_protein + total_carbs + total_fat == 0:
+            if totals.sum() == 0:
                 return None
             
             # Create the figure
-            fig, ax = plt.subplots(figsize=(8, 6))
+            fig, ax = self._prepare_figure(fig, (8, 6))
             
-            # Data for pie chart
-            sizes = [total_protein, total_carbs, total_fat]
-            labels = ['Protein', 'Carbohydrates', 'Fat']
-            colors = ['red', 'blue', 'orange']
+            # Data for pie chart, skipping empty slices so no zero-size wedge
+            # or "0.0%" label is drawn
+            present = totals > 0
+            sizes = totals[present]
+            names = np.array(['Protein', 'Carbohydrates', 'Fat'])[present]
+            colors = np.array(['red', 'blue', 'orange'])[present]
+            
+            # Label each slice with its total grams
+            labels = [f'{name}\n({size:.1f}g)' for name, size in zip(names, sizes)]
             
             # Create pie chart
-            wedges, texts, autotexts = ax.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%',
-                                             shadow=True, startangle=90)
+            ax.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%',
+                   shadow=True, startangle=90)
             
             # Customize the chart
             ax.set_title(f'Macro Nutrient Distribution - Last {days} Days', 
                         fontsize=14, fontweight='bold')
             
-            # Add total grams to labels
-            for i, (label, size) in enumerate(zip(labels, sizes)):
-                texts[i].set_text(f'{label}\n({size:.1f}g)')
-            
-            plt.tight_layout()
+            fig.tight_layout()
             return fig
             
         except Exception as e:
-            logger.error(f"Failed to create macro pie chart: {str(e)}")
-            return None
\ No newline at end of file
+            logger.error("Failed to create macro pie chart: %s", e)
+            return None
+    
+    def create_all_charts(self, days=30, max_workers=4):
+        """Create every chart for the last N days at once, drawing them on a thread pool
+        
+        Returns a dict of chart name -> figure (None where there is no data).
+        The weekly summary covers the whole weeks within the period.
+        """
+        periods = {name: days for name in ALL_CHARTS}
+        periods['Weekly Summary'] = max(1, days // 7)
+        
+        # Each chart has its own Figure and shares only the locked data cache,
+        # so they can be built concurrently
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {name: executor.submit(getattr(self, method), periods[name])
+                       for name, method in ALL_CHARTS.items()}
+        return {name: future.result() for name, future in futures.items()}